@@ -2,10 +2,9 @@ from pathlib import Path
 import time
 import synapse as syn
 from synapse.api.synapse_pb2 import DeviceConfiguration
-from synapse.api.channel_pb2 import Channel
-from synapse.api.query_pb2 import QueryRequest, ImpedanceQuery, QueryResponse
+from synapse.api.query_pb2 import QueryRequest, QueryResponse
 from google.protobuf import text_format
-from google.protobuf.json_format import Parse
+from synapse.utils.proto import load_proto_from_file
 
 
 def add_commands(subparsers):
@@ -43,23 +42,22 @@ def query(args):
         print("Query file must be a JSON file")
         return False
 
-    with open(args.query_file) as query_json:
-        query_proto = Parse(query_json.read(), QueryRequest())
-        print("Running query:")
-        print(query_proto)
+    query_proto = load_proto_from_file(args.query_file, QueryRequest())
+    print("Running query:")
+    print(query_proto)
 
-        result: QueryResponse = syn.Device(args.uri).query(query_proto)
-        if result:
-            
-            print(text_format.MessageToString(result))
+    result: QueryResponse = syn.Device(args.uri).query(query_proto)
+    if result:
+        
+        print(text_format.MessageToString(result))
 
-            if result.HasField("impedance_response"):
-                measurements = result.impedance_response
-                # Write impedance measurements to a CSV file
-                with open(f"impedance_measurements_{time.strftime('%Y%m%d-%H%M%S')}.csv", "w") as f:
-                    f.write("Electrode ID,Magnitude (Ohms),Phase (degrees),Status\n")
-                    for measurement in measurements.measurements:
-                        f.write(f"{measurement.electrode_id},{measurement.magnitude},{measurement.phase},1\n")
+        if result.HasField("impedance_response"):
+            measurements = result.impedance_response
+            # Write impedance measurements to a CSV file
+            with open(f"impedance_measurements_{time.strftime('%Y%m%d-%H%M%S')}.csv", "w") as f:
+                f.write("Electrode ID,Magnitude (Ohms),Phase (degrees),Status\n")
+                for measurement in measurements.measurements:
+                    f.write(f"{measurement.electrode_id},{measurement.magnitude},{measurement.phase},1\n")
 
 
 def start(args):
@@ -75,9 +73,8 @@ def configure(args):
         print("Configuration file must be a JSON file")
         return False
 
-    with open(args.config_file) as config_json:
-        config_proto = Parse(config_json.read(), DeviceConfiguration())
-        print("Configuring device with the following configuration:")
-        print(config_proto)
+    config_proto = load_proto_from_file(args.config_file, DeviceConfiguration())
+    print("Configuring device with the following configuration:")
+    print(config_proto)
 
-        return syn.Device(args.uri).configure(syn.Config.from_proto(config_proto))
+    return syn.Device(args.uri).configure(syn.Config.from_proto(config_proto))
@@ -1,14 +1,8 @@
 import os
 import re
 import getpass
-import serial
 from time import sleep
 
-if os.name == "nt":
-    from serial.tools.list_ports_windows import comports
-elif os.name == "posix":
-    from serial.tools.list_ports_posix import comports
-
 SCIFI_USB_VENDOR_ID = 0x0403
 SCIFI_USB_PRODUCT_ID = 0x6015
 
@@ -53,6 +47,13 @@ def add_commands(subparsers):
 
 
 def _list_devices(args):
+    # pyserial is imported on first use so that every other CLI command
+    # doesn't pay for loading it at startup
+    if os.name == "nt":
+        from serial.tools.list_ports_windows import comports
+    elif os.name == "posix":
+        from serial.tools.list_ports_posix import comports
+
     iterator = comports(include_links=False)
     ports = [
         port.device
@@ -83,6 +84,8 @@ def wifi_select(args):
     else:
         ssid = args.ssid
 
+    import serial
+
     console = serial.Serial(ports[0], 115200, timeout=1)
 
     if not _attempt_login(console, args.headstage_user, args.headstage_password):
@@ -134,6 +137,8 @@ def wifi_config(args):
 
     print("Configuring device to connect to network: %s" % ssid)
 
+    import serial
+
     console = serial.Serial(ports[0], 115200, timeout=1)
 
     _program_wpa_supplicant(
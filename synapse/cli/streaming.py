@@ -1,12 +1,15 @@
 import json
+import logging
+import multiprocessing
+import os
 import queue
-import threading
+import signal
 import time
 import traceback
 from typing import Optional
 from operator import itemgetter
 
-from google.protobuf.json_format import Parse
+import numpy as np
 
 from synapse.api.node_pb2 import NodeType
 from synapse.api.status_pb2 import DeviceState
@@ -14,6 +17,28 @@ from synapse.api.synapse_pb2 import DeviceConfiguration
 import synapse as syn
 import synapse.client.channel as channel
 import synapse.utils.ndtp_types as ndtp_types
+from synapse.utils.proto import load_proto_from_file
+
+# Large write buffer for the sink threads; trades up to 1 MiB of unflushed data
+# on a crash for far fewer write syscalls on a multi-MBps stream.
+WRITER_BUFFER_SIZE_BYTES = 1024 * 1024
+
+# Packets are handed to the writer in batches so each queue transfer (a pickle,
+# a pipe write and a wakeup of the writer process) is paid once per batch
+WRITER_BATCH_PACKETS = 16
+
+# A partial batch is still handed over once this long has passed since the last
+# one, so packets from a slow stream (e.g. spiketrain bins) don't sit in the reader
+WRITER_BATCH_INTERVAL_NS = 100_000_000
+
+# Bound on batches buffered for the writer; once full the reader blocks and
+# back-pressures into the socket receive buffer instead of growing memory
+WRITER_QUEUE_MAXSIZE = 256 // WRITER_BATCH_PACKETS
+
+# How long a blocked put waits before checking that the writer is still alive
+WRITER_PUT_TIMEOUT_S = 0.5
+
+SEQ_WARNING_INTERVAL_NS = 1_000_000_000
 
 
 def add_commands(subparsers):
@@ -32,10 +57,8 @@ def add_commands(subparsers):
 
 
 def load_config_from_file(path):
-    with open(path, "r") as f:
-        data = f.read()
-        proto = Parse(data, DeviceConfiguration())
-        return syn.Config.from_proto(proto)
+    proto = load_proto_from_file(path, DeviceConfiguration())
+    return syn.Config.from_proto(proto)
 
 
 def read(args):
@@ -100,22 +123,33 @@ def read(args):
         stream_out.device = device
 
     print(f"Streaming data... Ctrl+C to stop")
-    q = queue.Queue()
-    stop = threading.Event()
+    # Format and write in a separate process so the writer doesn't contend for
+    # the GIL with packet decoding in the reader
+    q = multiprocessing.Queue(maxsize=WRITER_QUEUE_MAXSIZE)
     if args.bin:
-        thread = threading.Thread(target=_binary_writer, args=(stop, q, num_ch))
+        writer = multiprocessing.Process(
+            target=_run_writer, args=(_binary_writer, q, num_ch)
+        )
     else:
-        thread = threading.Thread(target=_data_writer, args=(stop, q))
-    thread.start()
+        writer = multiprocessing.Process(target=_run_writer, args=(_data_writer, q))
+    writer.start()
+    reader_affinity = _pin_reader_and_writer(writer.pid)
 
     try:
-        read_packets(stream_out, q, args.duration)
+        read_packets(stream_out, q, writer, args.duration)
     except KeyboardInterrupt:
         pass
     finally:
         print("Stopping read...")
-        stop.set()
-        thread.join()
+        if writer.is_alive():
+            _put_to_writer(q, writer, None)
+        writer.join()
+        if writer.exitcode != 0:
+            logging.error(f"Writer process exited with code {writer.exitcode}")
+            # Nothing is left to drain the queue, so don't wait on it at exit
+            q.cancel_join_thread()
+        if reader_affinity is not None:
+            os.sched_setaffinity(0, reader_affinity)
 
     if args.config:
         print("Stopping device...")
@@ -125,87 +159,199 @@ def read(args):
         print("Stopped")
 
 
-def read_packets(node: syn.StreamOut, q: queue.Queue, duration: Optional[int] = None):
+def read_packets(
+    node: syn.StreamOut,
+    q: multiprocessing.Queue,
+    writer: multiprocessing.Process,
+    duration: Optional[int] = None,
+):
     packet_count = 0
     seq_number = None
     dropped_packets = 0
-    start = time.time()
+    writer_stalls = 0
+    last_seq_warning = None
+    suppressed_seq_warnings = 0
+    batch = []
+    start = time.monotonic_ns()
+    deadline = start + duration * 1_000_000_000 if duration else None
+    last_put = start
 
     print(f"Reading packets for duration {duration} seconds" if duration else "Reading packets...")
+    try:
+        while True:
+            header, data = node.read()
+            if not data:
+                continue
+
+            packet_count += 1
+            now = time.monotonic_ns()
+            if seq_number is None:
+                seq_number = header.seq_number
+            else:
+                expected = seq_number + 1
+                if expected == 2**16:
+                    expected = 0
+                if header.seq_number != expected:
+                    dropped_packets += header.seq_number - (expected)
+                    # Printing every gap floods the console (and slows reads further)
+                    # during a burst of drops, so report at most once per interval
+                    if last_seq_warning is None or now - last_seq_warning >= SEQ_WARNING_INTERVAL_NS:
+                        suppressed = f" ({suppressed_seq_warnings} more since last report)" if suppressed_seq_warnings else ""
+                        print(f"Seq number out of order: {header.seq_number} != {expected}{suppressed}")
+                        last_seq_warning = now
+                        suppressed_seq_warnings = 0
+                    else:
+                        suppressed_seq_warnings += 1
+                seq_number = header.seq_number
+
+            batch.append(data)
+            if len(batch) == WRITER_BATCH_PACKETS or now - last_put >= WRITER_BATCH_INTERVAL_NS:
+                try:
+                    q.put_nowait(batch)
+                except queue.Full:
+                    if writer_stalls == 0:
+                        logging.warning("Writer is falling behind; throttling reads")
+                    writer_stalls += 1
+                    if not _put_to_writer(q, writer, batch):
+                        logging.error("Writer process exited; stopping read")
+                        break
+                batch = []
+                last_put = now
+
+            # The clock is read once per packet above (monotonic_ns is a cheap vDSO
+            # read), so a slow stream stops within one packet of the deadline
+            if deadline and now > deadline:
+                break
+    finally:
+        # Hand the writer the partial batch too, including on Ctrl+C
+        if batch and writer.is_alive():
+            _put_to_writer(q, writer, batch)
+
+    elapsed = (time.monotonic_ns() - start) / 1e9
+    print(f"Recieved {packet_count} packets in {elapsed} seconds. Dropped {dropped_packets} packets ({(dropped_packets / packet_count) * 100}%)")
+    if writer_stalls:
+        print(f"Reader blocked on a full writer queue {writer_stalls} times")
+
+
+def _put_to_writer(q, writer, item):
+    # Block while the writer catches up, but give up once it has exited; with a
+    # bounded queue a dead writer would otherwise hang the reader for good
     while True:
-        header, data = node.read()
-        if not data:
-            continue
-
-        packet_count += 1
-        if seq_number is None:
-            seq_number = header.seq_number
-        else:
-            expected = seq_number + 1
-            if expected == 2**16:
-                expected = 0
-            if header.seq_number != expected:
-                print(f"Seq number out of order: {header.seq_number} != {expected}")
-                dropped_packets += header.seq_number - (expected)
-            seq_number = header.seq_number
-
-        q.put(data)
-
-        if duration and (time.time() - start) > duration:
-            break
+        try:
+            q.put(item, timeout=WRITER_PUT_TIMEOUT_S)
+            return True
+        except queue.Full:
+            if not writer.is_alive():
+                return False
+
+
+def _pin_reader_and_writer(writer_pid):
+    # Keep the writer on its own fixed core and the reader off it, so packet buffers
+    # stay warm in each core's cache instead of migrating with the scheduler (Linux
+    # only). The reader keeps every other allowed core rather than just one: the
+    # queue's feeder thread, which pickles batches and writes them to the pipe, runs
+    # in the reader process. On a two-core machine it still shares the reader's core.
+    # Returns the reader's original affinity so read() can restore it.
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+
+    cpus = os.sched_getaffinity(0)
+    if len(cpus) < 2:
+        return None
+
+    writer_cpu = sorted(cpus)[1]
+    try:
+        os.sched_setaffinity(writer_pid, {writer_cpu})
+        os.sched_setaffinity(0, cpus - {writer_cpu})
+    except OSError as e:
+        logging.warning(f"Could not pin reader/writer to CPUs: {e}")
+
+    return cpus
+
 
-    print(f"Recieved {packet_count} packets in {time.time() - start} seconds. Dropped {dropped_packets} packets ({(dropped_packets / packet_count) * 100}%)")
+def _run_writer(writer, *args):
+    # Ctrl+C is handled by the reader, which enqueues a None sentinel once it's done;
+    # the writer drains everything before it and exits
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    writer(*args)
 
 
-def _binary_writer(stop, q, num_ch):
+def _binary_writer(q, num_ch):
     filename = f"synapse_data_{time.strftime('%Y%m%d-%H%M%S')}.dat"
 
     print(f"Writing binary data from {num_ch} channels to {filename}")
     if filename:
-        fd = open(filename, "wb")
+        fd = open(filename, "wb", buffering=WRITER_BUFFER_SIZE_BYTES)
     
     channel_data = []
-    while not stop.is_set() or not q.empty():
-        try:
-            data: ndtp_types.ElectricalBroadbandData = q.get(True, 1)
-        except queue.Empty:
-            continue
+    skipped_other_data = False
+    skipped_wide_samples = False
+    while True:
+        batch = q.get()
+        if batch is None:
+            break
 
-        try:
-            for ch_id, samples in data.samples:
-                channel_data.append([ch_id, samples])
-                if len(channel_data) == num_ch:
-                    channel_data.sort(key=itemgetter(0))
-                    channel_samples = [ch_data[1] for ch_data in channel_data]
-                    frames = list(zip(*channel_samples))
-                    channel_data = []
-
-                    for frame in frames:
-                        for sample in frame:
-                            fd.write(int(sample).to_bytes(2, byteorder="little", signed=False))
-
-        except Exception as e:
-            print(f"Error processing data: {e}")
-            traceback.print_exc()
-            continue
-                
-
-def _data_writer(stop, q):
+        for data in batch:
+            # Only broadband samples have a place in the binary format; skip anything
+            # else, e.g. spiketrain data or an undecoded packet
+            if not isinstance(data, ndtp_types.ElectricalBroadbandData):
+                if not skipped_other_data:
+                    logging.error(
+                        f"Skipping {type(data).__name__} data; the binary format only holds broadband samples"
+                    )
+                    skipped_other_data = True
+                continue
+
+            # Each sample is stored as 16 bits; wider ones would be silently truncated
+            if data.bit_width > 16:
+                if not skipped_wide_samples:
+                    logging.error(
+                        f"Skipping {data.bit_width}-bit samples; the binary format only holds 16-bit samples"
+                    )
+                    skipped_wide_samples = True
+                continue
+
+            try:
+                for ch_id, samples in data.samples:
+                    channel_data.append([ch_id, samples])
+                    if len(channel_data) == num_ch:
+                        channel_data.sort(key=itemgetter(0))
+                        # Interleave channels into one contiguous (samples, channels)
+                        # array, truncated to the shortest channel; each row is a frame
+                        n_samples = min(len(ch_data[1]) for ch_data in channel_data)
+                        frames = np.stack(
+                            [ch_data[1][:n_samples] for ch_data in channel_data], axis=1
+                        )
+                        channel_data = []
+
+                        fd.write(frames.astype("<u2", copy=False).tobytes())
+
+            except Exception as e:
+                print(f"Error processing data: {e}")
+                traceback.print_exc()
+                continue
+
+    fd.close()
+
+
+def _data_writer(q):
     filename = f"synapse_data_{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
     if filename:
-        fd = open(filename, "wb")
+        fd = open(filename, "wb", buffering=WRITER_BUFFER_SIZE_BYTES)
 
-    while not stop.is_set() or not q.empty():
-        try:
-            data = q.get(True, 1)
-        except queue.Empty:
-            continue
+    while True:
+        batch = q.get()
+        if batch is None:
+            break
 
-        try:
-            fd.write(json.dumps(data.to_list()).encode("utf-8"))
-            fd.write(b"\n")
+        for data in batch:
+            try:
+                fd.write(json.dumps(data.to_list()).encode("utf-8"))
+                fd.write(b"\n")
+
+            except Exception as e:
+                print(f"Error processing data: {e}")
+                traceback.print_exc()
+                continue
 
-        except Exception as e:
-            print(f"Error processing data: {e}")
-            traceback.print_exc()
-            continue
+    fd.close()
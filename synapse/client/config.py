@@ -55,7 +55,7 @@ class Config(object):
         config = Config()
 
         for n in proto.nodes:
-            if n.type not in list(NODE_TYPE_OBJECT_MAP.keys()):
+            if n.type not in NODE_TYPE_OBJECT_MAP:
                 continue
             node = NODE_TYPE_OBJECT_MAP[n.type].from_proto(n)
 
@@ -64,9 +64,11 @@ class Config(object):
             else:
                 config.nodes.append(node)
 
+        # First node wins on duplicate ids, matching a linear search
+        nodes_by_id = {n.id: n for n in reversed(config.nodes)}
         for c in proto.connections:
-            src = next((n for n in config.nodes if n.id == c.src_node_id), None)
-            dst = next((n for n in config.nodes if n.id == c.dst_node_id), None)
+            src = nodes_by_id.get(c.src_node_id)
+            dst = nodes_by_id.get(c.dst_node_id)
             if src is None or dst is None:
                 continue
             config.connect(src, dst)
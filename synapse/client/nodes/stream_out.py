@@ -16,11 +16,15 @@ from synapse.utils.ndtp_types import (
 )
 
 
+RECV_BUFFER_SIZE_BYTES = 8192
+
+
 class StreamOut(Node):
     type = NodeType.kStreamOut
 
     def __init__(self, label=None, multicast_group=None):
         self.__socket = None
+        self.__recv_buffer = bytearray(RECV_BUFFER_SIZE_BYTES)
         self.__label = label
         self.__multicast_group: Optional[str] = multicast_group
 
@@ -28,8 +32,10 @@ class StreamOut(Node):
         if self.__socket is None:
             if self.open_socket() is None:
                 return None
-        data, _ = self.__socket.recvfrom(8192)
-        return self._unpack(data)
+        # Receive into a reused buffer; the slice below is the only copy made, and
+        # it's already the bytearray NDTPMessage.unpack would otherwise convert to
+        n, _ = self.__socket.recvfrom_into(self.__recv_buffer)
+        return self._unpack(self.__recv_buffer[:n])
 
     def open_socket(self):
         print("Opening socket")
@@ -88,11 +88,27 @@ class SpectralFilter(BaseNode):
 
     async def run(self):
         while self.running:
-            data = await self.data_queue.get()
-            filtered_samples = self.apply_filter(data.samples)
-
-            await self.emit_data(
-                ElectricalBroadbandData(
-                    data.t0, data.bit_width, filtered_samples, data.sample_rate
+            batch = [await self.data_queue.get()]
+            while not self.data_queue.empty():
+                batch.append(self.data_queue.get_nowait())
+
+            # Filter everything that queued up in a single lfilter call, then
+            # split the result back into the original frames
+            merged_samples = [
+                [channel_id, np.concatenate([data.samples[i][1] for data in batch])]
+                for i, (channel_id, _) in enumerate(batch[0].samples)
+            ]
+            filtered_samples = self.apply_filter(merged_samples)
+
+            start = 0
+            for data in batch:
+                end = start + len(data.samples[0][1])
+                await self.emit_data(
+                    ElectricalBroadbandData(
+                        data.t0,
+                        data.bit_width,
+                        [[channel_id, samples[start:end]] for channel_id, samples in filtered_samples],
+                        data.sample_rate,
+                    )
                 )
-            )
+                start = end
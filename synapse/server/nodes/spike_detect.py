@@ -1,6 +1,8 @@
 import queue
 from collections import defaultdict
 
+import numpy as np
+
 from synapse.api.datatype_pb2 import DataType
 from synapse.api.node_pb2 import NodeType
 from synapse.api.nodes.spike_detect_pb2 import SpikeDetectConfig
@@ -15,7 +17,7 @@ class SpikeDetect(BaseNode):
     def __init__(self, id):
         super().__init__(id, NodeType.kSpikeDetect)
         self.samples_since_last_spike = defaultdict(lambda: 0)
-        self.channel_buffers = defaultdict(list)
+        self.channel_buffers = {}  # channel id -> 1-D sample array
         self.__config = None
 
     def config(self):
@@ -59,37 +61,93 @@ class SpikeDetect(BaseNode):
                 self.logger.warning("Received non-broadband data")
                 continue
 
-            for channel_id, samples in data.samples:
-                self.channel_buffers[channel_id].extend(samples)
-
-            refractory_period_in_samples = int(REFRACTORY_PERIOD_S * data.sample_rate)
-            bin_size_in_samples = int(self.bin_size_ms * data.sample_rate / 1000)
-
-            while any(
-                len(buffer) >= bin_size_in_samples
-                for buffer in self.channel_buffers.values()
-            ):
-                spike_counts = []
-                for channel_id, buffer in self.channel_buffers.items():
-                    spike_count = 0
-                    if len(buffer) >= bin_size_in_samples:
-                        # pop a bin's worth of samples off the buffer
-                        self.channel_buffers[channel_id] = buffer[bin_size_in_samples:]
-                        bin_samples = buffer[:bin_size_in_samples]
-
-                        for sample in bin_samples:
-                            threshold_crossed = abs(sample) > self.threshold_uV
-                            since_spike = self.samples_since_last_spike[channel_id]
-                            recovered = since_spike > refractory_period_in_samples
-
-                            if threshold_crossed and recovered:
-                                spike_count += 1
-                                self.samples_since_last_spike[channel_id] = 0
-                            else:
-                                self.samples_since_last_spike[channel_id] += 1
-
-                    spike_counts.append(spike_count)
-
+            for spike_counts in self._detect_spikes(data):
                 await self.emit_data(
                     SpiketrainData(t0=data.t0, bin_size_ms=self.bin_size_ms, spike_counts=spike_counts)
                 )
+
+    def _detect_spikes(self, data):
+        # Each channel is buffered on its own, so frames may carry a different
+        # number of samples per channel and channels may come and go
+        for channel_id, samples in data.samples:
+            samples = np.asarray(samples)
+            buffer = self.channel_buffers.get(channel_id)
+            if buffer is None:
+                self.channel_buffers[channel_id] = samples
+            else:
+                self.channel_buffers[channel_id] = np.concatenate((buffer, samples))
+
+        refractory_period_in_samples = int(REFRACTORY_PERIOD_S * data.sample_rate)
+        bin_size_in_samples = int(self.bin_size_ms * data.sample_rate / 1000)
+
+        bins = []
+        while any(
+            len(buffer) >= bin_size_in_samples
+            for buffer in self.channel_buffers.values()
+        ):
+            spike_counts = []
+            for channel_id, buffer in self.channel_buffers.items():
+                spike_count = 0
+                if len(buffer) >= bin_size_in_samples:
+                    # pop a bin's worth of samples off the buffer
+                    self.channel_buffers[channel_id] = buffer[bin_size_in_samples:]
+                    threshold_crossed = _threshold_crossings(
+                        buffer[:bin_size_in_samples], self.threshold_uV
+                    )
+                    spike_count = self._count_spikes(
+                        channel_id,
+                        np.flatnonzero(threshold_crossed),
+                        bin_size_in_samples,
+                        refractory_period_in_samples,
+                    )
+
+                spike_counts.append(spike_count)
+
+            bins.append(spike_counts)
+
+        return bins
+
+    def _count_spikes(self, channel_id, crossings, n_samples, refractory_period_in_samples):
+        # Only threshold crossings can be spikes, so walk those rather than every
+        # sample; the refractory counter is derived from the distance between them
+        since_spike = self.samples_since_last_spike[channel_id]
+        last_spike = -1
+        spike_count = 0
+
+        for idx in crossings:
+            if last_spike < 0:
+                elapsed = since_spike + idx
+            else:
+                elapsed = idx - last_spike - 1
+
+            if elapsed > refractory_period_in_samples:
+                spike_count += 1
+                last_spike = idx
+
+        if last_spike < 0:
+            self.samples_since_last_spike[channel_id] = since_spike + n_samples
+        else:
+            self.samples_since_last_spike[channel_id] = n_samples - last_spike - 1
+
+        return spike_count
+
+
+def _threshold_crossings(samples, threshold):
+    # |x| > t as (x > t) | (x < -t): skips the np.abs temporary, and unlike np.abs
+    # doesn't wrap the most negative integer sample back to a negative value
+    if samples.dtype.kind not in "iu":
+        return (samples > threshold) | (samples < -threshold)
+
+    # For integer samples compare against an integer threshold in the samples' own
+    # dtype, rather than promoting every sample to float64 to meet the float one;
+    # x > t is x > floor(t) for integer x
+    t = np.floor(threshold)
+    if t < 0:
+        return np.ones(samples.shape, dtype=bool)
+    if t > np.iinfo(samples.dtype).max:
+        return np.zeros(samples.shape, dtype=bool)
+
+    t = samples.dtype.type(t)
+    if samples.dtype.kind == "u":
+        return samples > t
+    return (samples > t) | (samples < -t)
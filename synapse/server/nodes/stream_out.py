@@ -80,13 +80,17 @@ class StreamOut(BaseNode):
             data = await self.data_queue.get()
             packets = self._pack(data)
 
-            for packet in packets:
-                await loop.run_in_executor(
-                    None,
-                    self.__socket.sendto,
-                    packet,
-                    (self.socket[0], self.socket[1]),
-                )
+            # Drain whatever else queued up while we were waiting, so the whole
+            # batch goes out in a single hop to the executor
+            while not self.data_queue.empty():
+                packets.extend(self._pack(self.data_queue.get_nowait()))
+
+            await loop.run_in_executor(None, self._send_packets, packets)
+
+    def _send_packets(self, packets: List[bytes]):
+        addr = (self.socket[0], self.socket[1])
+        for packet in packets:
+            self.__socket.sendto(packet, addr)
 
     def _pack(self, data: SynapseData) -> List[bytes]:
         packets = []
@@ -1,15 +1,23 @@
 import asyncio
-import random
 import time
 
+import numpy as np
+
 from synapse.api.node_pb2 import NodeType
 from synapse.api.nodes.electrical_broadband_pb2 import ElectricalBroadbandConfig
 from synapse.server.nodes.base import BaseNode
 from synapse.server.status import Status
 from synapse.utils.ndtp_types import ElectricalBroadbandData
 
-def r_sample(bit_width: int):
-    return random.randint(0, 2**bit_width - 1)
+def r_samples(rng: np.random.Generator, bit_width: int, n_samples: int):
+    # Smallest unsigned dtype that holds a bit_width sample, at least uint16
+    if bit_width <= 16:
+        dtype = np.uint16
+    elif bit_width <= 32:
+        dtype = np.uint32
+    else:
+        dtype = np.uint64
+    return rng.integers(0, 2**bit_width, size=n_samples, dtype=dtype)
 
 
 class ElectricalBroadband(BaseNode):
@@ -40,18 +48,26 @@ class ElectricalBroadband(BaseNode):
         channels = c.channels if c.channels else []
         sample_rate = c.sample_rate if c.sample_rate else 16000
 
+        rng = np.random.default_rng()
+
         t0 = time.time_ns() // 1000
         while self.running:
             now = time.time_ns() // 1000
             elapsed = now - t0
             n_samples = int(sample_rate * elapsed / 1e6)
 
+            # Nothing to generate; don't push an empty frame through the
+            # downstream nodes, and let the samples accrue to the next tick
+            if not channels or n_samples == 0:
+                await asyncio.sleep(0.100)
+                continue
+
             data = ElectricalBroadbandData(
                 bit_width=bit_width,
                 is_signed=False,
                 sample_rate=sample_rate,
                 t0=t0,
-                samples=[[ch.id, [r_sample(bit_width) for _ in range(n_samples)]] for ch in channels]
+                samples=[[ch.id, r_samples(rng, bit_width, n_samples)] for ch in channels]
             )
 
             await self.emit_data(data)
@@ -1,3 +1,4 @@
+import logging
 import queue
 from synapse.server.nodes.base import BaseNode
 from synapse.server.status import Status
@@ -26,7 +27,7 @@ class OpticalStimulation(BaseNode):
             data = await self.data_queue.get()
 
             # write to the device somehow, but here, just log it
-            value = int.from_bytes(data, byteorder="big")
-            self.logger.debug("received data: %i" % (self.id, value))
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("received data: %s", data.hex())
 
         self.logger.debug("exited thread")
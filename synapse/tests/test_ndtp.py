@@ -1,5 +1,8 @@
+import pickle
+import random
 import struct
 
+import numpy as np
 import pytest
 
 from synapse.api.datatype_pb2 import DataType
@@ -11,6 +14,7 @@ from synapse.utils.ndtp import (
     NDTPPayloadBroadbandChannelData,
     NDTPPayloadSpiketrain,
     to_bytes,
+    to_int_array,
     to_ints,
 )
 
@@ -122,6 +126,158 @@ def test_to_ints():
         to_ints(b"\x01\x02", 3)
 
 
+def test_to_ints_byte_aligned():
+    assert to_ints(b"\x01\xFF\x80", 8) == ([1, 255, 128], 24, b"\x01\xFF\x80")
+    res, offset, _ = to_ints(b"\x01\xFF\x80", 8, is_signed=True)
+    assert res == [1, -1, -128]
+    assert offset == 24
+    res, offset, _ = to_ints(b"\x01\xFF\x80", 8, is_signed=True, byteorder="little")
+    assert res == [1, -1, -128]
+    assert offset == 24
+
+    res, offset, _ = to_ints(b"\x12\x34\xFF\xFE", 16)
+    assert res == [0x1234, 0xFFFE]
+    assert offset == 32
+    res, offset, _ = to_ints(b"\x12\x34\xFF\xFE", 16, is_signed=True)
+    assert res == [0x1234, -2]
+    res, offset, _ = to_ints(b"\x12\x34\xFF\xFE", 16, byteorder="little")
+    assert res == [0x3412, 0xFEFF]
+    assert offset == 32
+    res, offset, _ = to_ints(b"\x12\x34\xFF\xFE", 16, is_signed=True, byteorder="little")
+    assert res == [0x3412, -257]
+
+    res, offset, _ = to_ints(b"\x01\x02\x03\xFF\xFF\xFF", 24)
+    assert res == [0x010203, 0xFFFFFF]
+    assert offset == 48
+    res, offset, _ = to_ints(b"\x01\x02\x03\xFF\xFF\xFF", 24, is_signed=True)
+    assert res == [0x010203, -1]
+    res, offset, _ = to_ints(b"\x01\x02\x03\xFF\xFF\xFF", 24, byteorder="little")
+    assert res == [0x030201, 0xFFFFFF]
+    res, offset, _ = to_ints(
+        b"\x01\x02\x03\xFF\xFF\xFF", 24, is_signed=True, byteorder="little"
+    )
+    assert res == [0x030201, -1]
+    assert offset == 48
+
+    # Count shorter than the data
+    res, offset, _ = to_ints(b"\x12\x34\x56\x78", 16, 1)
+    assert res == [0x1234]
+    assert offset == 16
+
+
+def test_to_ints_start_bit():
+    # Whole bytes are skipped, and the offset is relative to the returned data
+    res, offset, rest = to_ints(b"\xAA\x12\x34", 16, 1, 8)
+    assert res == [0x1234]
+    assert offset == 16
+    assert bytes(rest) == b"\x12\x34"
+
+    res, offset, _ = to_ints(b"\xAA\x12\x34", 16, 1, 8, byteorder="little")
+    assert res == [0x3412]
+    assert offset == 16
+
+    # Values that straddle byte boundaries
+    res, offset, _ = to_ints(b"\xF1\x23\x4F", 16, 1, 4)
+    assert res == [0x1234]
+    assert offset == 20
+
+    res, offset, _ = to_ints(b"\xFF\xFF\xF0", 16, 1, 4, is_signed=True)
+    assert res == [-1]
+    assert offset == 20
+
+    res, offset, _ = to_ints(b"\xF1\x23\x4F", 16, 1, 4, byteorder="little")
+    assert res == [62015]
+    assert offset == 20
+
+    res, offset, _ = to_ints(b"\xF1\x23\x4F", 16, 1, 4, is_signed=True, byteorder="little")
+    assert res == [-3521]
+    assert offset == 20
+
+
+def test_to_ints_partial_trailing_value():
+    # Without a count, data that doesn't end on a value boundary is an error,
+    # including for byte-aligned widths
+    with pytest.raises(ValueError):
+        to_ints(b"\x12\x34\x56", 16)
+
+    with pytest.raises(ValueError):
+        to_ints(b"\x12\x34\x56", 16, byteorder="little")
+
+    with pytest.raises(ValueError):
+        to_ints(b"\x12\x34\x56\x78", 24)
+
+    with pytest.raises(ValueError):
+        to_int_array(b"\x12\x34\x56", 16)
+
+    # With a count, trailing bytes are ignored
+    res, offset, _ = to_ints(b"\x12\x34\x56", 16, 1)
+    assert res == [0x1234]
+    assert offset == 16
+
+
+def test_to_int_array():
+    values, offset, rest = to_int_array(bytearray(b"\x12\x34\xFF\xFE"), 16, is_signed=True)
+    assert memoryview(values).format == "i"
+    assert list(values) == [0x1234, -2]
+    assert offset == 32
+    assert bytes(rest) == b"\x12\x34\xFF\xFE"
+
+    values, offset, _ = to_int_array(memoryview(b"\x6C"), 2, 3, 2)
+    assert list(values) == [2, 3, 0]
+    assert offset == 8
+
+    with pytest.raises(TypeError):
+        to_int_array([1, 2], 8)
+
+
+def reference_to_ints(data, bit_width, count, start_bit, is_signed, byteorder):
+    # Bit-at-a-time decoder used as the reference for the optimized paths
+    bits = []
+    for i, byte in enumerate(data[start_bit // 8:]):
+        for pos in range(start_bit % 8 if i == 0 else 0, 8):
+            if byteorder == "big":
+                bits.append((byte >> (7 - pos)) & 1)
+            else:
+                bits.append((byte >> pos) & 1)
+
+    n_values = count if count > 0 else len(bits) // bit_width
+    values = []
+    for v in range(n_values):
+        value = 0
+        for k, bit in enumerate(bits[v * bit_width:(v + 1) * bit_width]):
+            if byteorder == "big":
+                value = (value << 1) | bit
+            else:
+                value |= bit << k
+        if is_signed and value & (1 << (bit_width - 1)):
+            value -= 1 << bit_width
+        values.append(value)
+
+    return values, start_bit % 8 + n_values * bit_width
+
+
+def test_to_ints_matches_reference():
+    rng = random.Random(0)
+    for _ in range(2000):
+        bit_width = rng.choice([8, 16, 24, rng.randint(1, 24)])
+        byteorder = rng.choice(["big", "little"])
+        is_signed = rng.random() < 0.5
+        if rng.random() < 0.5:
+            # No count: the data holds a whole number of values
+            count = 0
+            start_bit = rng.choice([0, 8])
+            n_bytes = start_bit // 8 + bit_width * rng.randint(1, 8)
+        else:
+            count = rng.randint(1, 20)
+            start_bit = rng.randint(0, 15)
+            n_bytes = (start_bit + bit_width * count + 7) // 8 + rng.randint(0, 3)
+        data = bytes(rng.getrandbits(8) for _ in range(n_bytes))
+
+        expected = reference_to_ints(data, bit_width, count, start_bit, is_signed, byteorder)
+        res, offset, _ = to_ints(data, bit_width, count, start_bit, is_signed, byteorder)
+        assert (res, offset) == expected, (data, bit_width, count, start_bit, is_signed, byteorder)
+
+
 def test_ndtp_payload_broadband():
     bit_width = 12
     sample_rate = 3
@@ -379,6 +535,30 @@ def test_ndtp_message_broadband_large():
         assert u_payload.channels[i].channel_id == c.channel_id
         assert list(u_payload.channels[i].channel_data) == list(c.channel_data)
 
+def test_ndtp_message_broadband_pickle():
+    header = NDTPHeader(DataType.kBroadband, timestamp=1234567890, seq_number=42)
+    payload = NDTPPayloadBroadband(
+        bit_width=12,
+        sample_rate=3,
+        is_signed=True,
+        channels=[
+            NDTPPayloadBroadbandChannelData(channel_id=1, channel_data=[-1000, 0, 1000]),
+            NDTPPayloadBroadbandChannelData(channel_id=2, channel_data=[1, 2, 3]),
+        ],
+    )
+    unpacked = NDTPMessage.unpack(NDTPMessage(header, payload).pack())
+
+    # Unpacked samples are handed out as ndarrays, which survive a pickle round
+    # trip (e.g. through a multiprocessing.Queue)
+    for c in unpacked.payload.channels:
+        assert isinstance(c.channel_data, np.ndarray)
+
+    restored = pickle.loads(pickle.dumps(unpacked))
+    assert restored.header == unpacked.header
+    assert restored.payload == payload
+    assert restored.payload.channels[0].channel_data.tolist() == [-1000, 0, 1000]
+
+
 def test_ndtp_message_spiketrain():
     header = NDTPHeader(DataType.kSpiketrain, timestamp=1234567890, seq_number=42)
     payload = NDTPPayloadSpiketrain(bin_size_ms=10, spike_counts=[1, 2, 3, 2, 1])
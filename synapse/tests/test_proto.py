@@ -0,0 +1,28 @@
+import pytest
+from google.protobuf.json_format import ParseError
+
+from synapse.api.synapse_pb2 import DeviceConfiguration
+from synapse.utils.proto import load_proto_from_file
+
+
+def test_load_proto_from_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"connections": [{"src_node_id": 1, "dst_node_id": 2}]}')
+
+    config = load_proto_from_file(path, DeviceConfiguration())
+    assert len(config.connections) == 1
+    assert config.connections[0].src_node_id == 1
+    assert config.connections[0].dst_node_id == 2
+
+
+def test_load_proto_from_file_malformed(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"connections": [')
+
+    # Reported like json_format.Parse reports it
+    with pytest.raises(ParseError):
+        load_proto_from_file(path, DeviceConfiguration())
+
+    path.write_text('{"not_a_field": 1}')
+    with pytest.raises(ParseError):
+        load_proto_from_file(path, DeviceConfiguration())
@@ -0,0 +1,58 @@
+import asyncio
+
+import numpy as np
+from scipy import signal
+
+from synapse.api.nodes.spectral_filter_pb2 import SpectralFilterMethod
+from synapse.server.nodes.spectral_filter import SpectralFilter, get_filter_coefficients
+from synapse.utils.ndtp_types import ElectricalBroadbandData
+
+
+def test_spectral_filter_splits_batched_frames():
+    sample_rate = 30000
+    node = SpectralFilter(id=1)
+    node.b, node.a = get_filter_coefficients(
+        SpectralFilterMethod.kBandPass, 300, 3000, sample_rate
+    )
+
+    # Frames of different lengths queue up before run() wakes, so they're all
+    # filtered in one batch and must be split back into their own frames
+    rng = np.random.default_rng(0)
+    frames = [
+        ElectricalBroadbandData(
+            t0=1000 + i,
+            bit_width=16,
+            samples=[
+                (1, rng.standard_normal(n_samples) * 100),
+                (2, rng.standard_normal(n_samples) * 100),
+            ],
+            sample_rate=sample_rate,
+        )
+        for i, n_samples in enumerate([5, 17, 1, 40])
+    ]
+    for data in frames:
+        node.data_queue.put_nowait(data)
+
+    emitted = []
+
+    async def emit_data(data):
+        emitted.append(data)
+        if len(emitted) == len(frames):
+            node.running = False
+
+    node.emit_data = emit_data
+    node.running = True
+    asyncio.run(node.run())
+
+    assert [data.t0 for data in emitted] == [data.t0 for data in frames]
+
+    # Each frame must match filtering it on its own, with the state carried over
+    zi = np.outer(np.ones(2), signal.lfilter_zi(node.b, node.a))
+    for data, out in zip(frames, emitted):
+        expected, zi = signal.lfilter(
+            node.b, node.a, np.stack([s for _, s in data.samples]), axis=1, zi=zi
+        )
+        assert [channel_id for channel_id, _ in out.samples] == [1, 2]
+        for i, (_, samples) in enumerate(out.samples):
+            assert len(samples) == len(data.samples[i][1])
+            np.testing.assert_allclose(samples, expected[i])
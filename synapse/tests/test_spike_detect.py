@@ -0,0 +1,154 @@
+from collections import defaultdict
+
+import numpy as np
+
+from synapse.server.nodes.spike_detect import SpikeDetect, _threshold_crossings
+from synapse.utils.ndtp_types import ElectricalBroadbandData
+
+
+def test_threshold_crossings_int16():
+    samples = np.array([[-32768, -51, -50, 0, 50, 51, 32767]], dtype=np.int16)
+
+    # np.abs(-32768) wraps to -32768 in int16; it must still count as a crossing
+    assert _threshold_crossings(samples, 50).tolist() == [
+        [True, True, False, False, False, True, True]
+    ]
+
+    # A fractional threshold compares like the real value, not a rounded one
+    assert _threshold_crossings(samples, 50.5).tolist() == [
+        [True, True, False, False, False, True, True]
+    ]
+    assert _threshold_crossings(samples, 49.5).tolist() == [
+        [True, True, True, False, True, True, True]
+    ]
+
+
+def test_threshold_crossings_negative_threshold():
+    samples = np.array([-5, 0, 5], dtype=np.int16)
+    assert _threshold_crossings(samples, -1).tolist() == [True, True, True]
+
+    samples = np.array([0, 5], dtype=np.uint16)
+    assert _threshold_crossings(samples, -0.5).tolist() == [True, True]
+
+
+def test_threshold_crossings_above_dtype_range():
+    samples = np.array([-32768, 0, 32767], dtype=np.int16)
+    assert _threshold_crossings(samples, 40000).tolist() == [False, False, False]
+
+    # Only the most negative sample exceeds iinfo.max in magnitude
+    assert _threshold_crossings(samples, 32767).tolist() == [True, False, False]
+
+
+def test_threshold_crossings_unsigned():
+    samples = np.array([0, 50, 51, 65535], dtype=np.uint16)
+    assert _threshold_crossings(samples, 50).tolist() == [False, False, True, True]
+    assert _threshold_crossings(samples, 50.5).tolist() == [False, False, True, True]
+
+
+def test_threshold_crossings_float():
+    samples = np.array([-50.5, -50.0, 0.0, 50.0, 50.25, np.nan], dtype=np.float32)
+    assert _threshold_crossings(samples, 50).tolist() == [
+        True, False, False, False, True, False
+    ]
+
+
+def test_threshold_crossings_matches_abs():
+    rng = np.random.default_rng(0)
+    for dtype in (np.int16, np.int32, np.uint16, np.float32):
+        samples = (rng.standard_normal((4, 256)) * 1000).astype(dtype)
+        for threshold in (0, 10, 99.5, 1000, 2500.75):
+            expected = np.abs(samples.astype(np.float64)) > threshold
+            assert np.array_equal(_threshold_crossings(samples, threshold), expected)
+
+
+def make_node(threshold_uV=100, bin_size_ms=1):
+    node = SpikeDetect(id=1)
+    node.threshold_uV = threshold_uV
+    node.bin_size_ms = bin_size_ms
+    return node
+
+
+def frame(samples, sample_rate=4000):
+    return ElectricalBroadbandData(
+        t0=0, bit_width=16, samples=samples, sample_rate=sample_rate, is_signed=True
+    )
+
+
+def reference_detect_spikes(frames, threshold_uV, bin_size_ms):
+    # Sample-at-a-time detector the vectorized one must match
+    samples_since_last_spike = defaultdict(lambda: 0)
+    channel_buffers = defaultdict(list)
+    bins = []
+    for data in frames:
+        for channel_id, samples in data.samples:
+            channel_buffers[channel_id].extend(int(s) for s in samples)
+
+        refractory = int(0.001 * data.sample_rate)
+        bin_size = int(bin_size_ms * data.sample_rate / 1000)
+        while any(len(buffer) >= bin_size for buffer in channel_buffers.values()):
+            spike_counts = []
+            for channel_id, buffer in channel_buffers.items():
+                spike_count = 0
+                if len(buffer) >= bin_size:
+                    channel_buffers[channel_id] = buffer[bin_size:]
+                    for sample in buffer[:bin_size]:
+                        recovered = samples_since_last_spike[channel_id] > refractory
+                        if abs(sample) > threshold_uV and recovered:
+                            spike_count += 1
+                            samples_since_last_spike[channel_id] = 0
+                        else:
+                            samples_since_last_spike[channel_id] += 1
+                spike_counts.append(spike_count)
+            bins.append(spike_counts)
+    return bins
+
+
+def test_spike_detect_refractory_period():
+    # 4 samples per bin, 4 samples refractory period at 4 kHz
+    node = make_node()
+    samples = np.zeros(12, dtype=np.int16)
+    samples[[0, 5, 6, 11]] = 200
+
+    # 0 is within the initial refractory period and 6 is right after the spike
+    # at 5; the counter carries across bins, so 11 is a spike again
+    assert node._detect_spikes(frame([(1, samples)])) == [[0], [1], [1]]
+    assert node.samples_since_last_spike[1] == 0
+    assert reference_detect_spikes(
+        [frame([(1, samples)])], threshold_uV=100, bin_size_ms=1
+    ) == [[0], [1], [1]]
+
+
+def test_spike_detect_ragged_and_changing_channels():
+    node = make_node()
+    spike = np.array([0, 0, 0, 0, 0, 200, 0, 0], dtype=np.int16)
+
+    # Channels with a different number of samples in the same frame
+    assert node._detect_spikes(frame([(1, spike), (2, spike[:6])])) == [[0, 0], [1, 0]]
+
+    # Channel 2 keeps its buffered samples; channel 3 joins, channel 1 drops out
+    assert node._detect_spikes(frame([(2, spike[:2]), (3, spike)])) == [
+        [0, 1, 0],
+        [0, 0, 1],
+    ]
+
+
+def test_spike_detect_matches_reference():
+    rng = np.random.default_rng(0)
+    frames = []
+    for _ in range(50):
+        channel_ids = sorted(rng.choice(8, size=rng.integers(1, 6), replace=False))
+        frames.append(
+            frame(
+                [
+                    (int(ch), (rng.standard_normal(rng.integers(0, 40)) * 100).astype(np.int16))
+                    for ch in channel_ids
+                ]
+            )
+        )
+
+    node = make_node(threshold_uV=150)
+    bins = []
+    for data in frames:
+        bins.extend(node._detect_spikes(data))
+
+    assert bins == reference_detect_spikes(frames, threshold_uV=150, bin_size_ms=1)
@@ -162,3 +162,19 @@ def test_packing_spiketrain_data():
     assert len(unpacked.payload.spike_counts) == len(sdata.spike_counts)
 
     assert list(unpacked.payload.spike_counts) == list(sdata.spike_counts)
+
+
+def test_unpacking_wide_broadband_data():
+    bdata = ElectricalBroadbandData(
+        bit_width=24,
+        sample_rate=3,
+        t0=1234567890,
+        samples=[(1, np.array([-8388608, -70000, 70000, 8388607], dtype=np.int32))],
+        is_signed=True
+    )
+
+    packed, _ = bdata.pack(0)
+    unpacked = ElectricalBroadbandData.unpack(packed[0])
+
+    assert unpacked.bit_width == 24
+    assert unpacked.samples[0][1].tolist() == [-8388608, -70000, 70000, 8388607]
@@ -0,0 +1,176 @@
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from synapse.cli.streaming import (
+    _binary_writer,
+    _data_writer,
+    _pin_reader_and_writer,
+    read_packets,
+)
+from synapse.utils.ndtp_types import ElectricalBroadbandData, SpiketrainData
+
+
+def run_writer(writer, tmp_path, monkeypatch, batches, *args):
+    # Items on a multiprocessing.Queue are pickled on the way through, as they
+    # are when handed to the writer process
+    monkeypatch.chdir(tmp_path)
+    q = multiprocessing.Queue()
+    for batch in batches:
+        q.put(batch)
+    q.put(None)
+    writer(q, *args)
+
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1
+    return files[0]
+
+
+def broadband_packets():
+    bdata = ElectricalBroadbandData(
+        bit_width=16,
+        sample_rate=3,
+        t0=1234567890,
+        samples=[
+            (1, np.array([1000, 2000, 1000], dtype=np.uint16)),
+            (2, np.array([1234, 4321, 1234], dtype=np.uint16)),
+        ],
+        is_signed=False,
+    )
+    packets, _ = bdata.pack(0)
+    return [ElectricalBroadbandData.unpack(p) for p in packets]
+
+
+def spiketrain_packets():
+    packets = []
+    for seq in range(3):
+        sdata = SpiketrainData(t0=1000 + seq, bin_size_ms=10, spike_counts=[0, 1, 2, seq])
+        packed, _ = sdata.pack(seq)
+        packets.append(SpiketrainData.unpack(packed[0]))
+    return packets
+
+
+def test_data_writer_spiketrain(tmp_path, monkeypatch):
+    packets = spiketrain_packets()
+    path = run_writer(_data_writer, tmp_path, monkeypatch, [packets[:2], packets[2:]])
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        [1000, 10, [0, 1, 2, 0]],
+        [1001, 10, [0, 1, 2, 1]],
+        [1002, 10, [0, 1, 2, 2]],
+    ]
+
+
+def test_data_writer_broadband(tmp_path, monkeypatch):
+    path = run_writer(_data_writer, tmp_path, monkeypatch, [broadband_packets()])
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        [1234567890, [[1, [1000, 2000, 1000]]]],
+        [1234567890, [[2, [1234, 4321, 1234]]]],
+    ]
+
+
+def test_binary_writer_broadband(tmp_path, monkeypatch):
+    path = run_writer(_binary_writer, tmp_path, monkeypatch, [broadband_packets()], 2)
+
+    frames = np.frombuffer(path.read_bytes(), dtype="<u2").reshape(-1, 2)
+    assert frames.tolist() == [[1000, 1234], [2000, 4321], [1000, 1234]]
+
+
+def test_binary_writer_skips_wide_samples(tmp_path, monkeypatch):
+    wide = ElectricalBroadbandData(
+        bit_width=24,
+        sample_rate=3,
+        t0=0,
+        samples=[
+            (1, np.array([70000, 1, 2], dtype=np.uint32)),
+            (2, np.array([3, 4, 5], dtype=np.uint32)),
+        ],
+        is_signed=False,
+    )
+    path = run_writer(
+        _binary_writer, tmp_path, monkeypatch, [[wide], broadband_packets()], 2
+    )
+
+    frames = np.frombuffer(path.read_bytes(), dtype="<u2").reshape(-1, 2)
+    assert frames.tolist() == [[1000, 1234], [2000, 4321], [1000, 1234]]
+
+
+def test_binary_writer_skips_non_broadband(tmp_path, monkeypatch):
+    # e.g. --bin on a spike-detect StreamOut, or a packet of an unknown data type
+    other = [spiketrain_packets()[0], bytearray(b"\x01\x02")]
+    path = run_writer(
+        _binary_writer, tmp_path, monkeypatch, [other + broadband_packets()], 2
+    )
+
+    frames = np.frombuffer(path.read_bytes(), dtype="<u2").reshape(-1, 2)
+    assert frames.tolist() == [[1000, 1234], [2000, 4321], [1000, 1234]]
+
+
+class FakeStreamOut:
+    def __init__(self):
+        self.seq_number = 0
+
+    def read(self):
+        header = SimpleNamespace(seq_number=self.seq_number)
+        self.seq_number = (self.seq_number + 1) % 2**16
+        return header, self.seq_number
+
+
+def test_read_packets_stops_when_writer_exits():
+    q = multiprocessing.Queue(maxsize=1)
+    writer = multiprocessing.Process(target=int)
+    writer.start()
+    writer.join()
+
+    # Nothing drains the queue, so this only returns if the dead writer is noticed
+    read_packets(FakeStreamOut(), q, writer)
+
+    q.cancel_join_thread()
+
+
+def test_read_packets_flushes_partial_batches(monkeypatch):
+    # One packet every 60 ms, far fewer than a full batch per flush interval
+    clock = itertools.count(0, 60_000_000)
+    monkeypatch.setattr(time, "monotonic_ns", lambda: next(clock))
+    q = queue.Queue()
+    writer = SimpleNamespace(is_alive=lambda: True)
+
+    read_packets(FakeStreamOut(), q, writer, duration=1)
+
+    batches = []
+    while not q.empty():
+        batches.append(q.get_nowait())
+    assert [len(batch) for batch in batches] == [2] * 8 + [1]
+    assert [data for batch in batches for data in batch] == list(range(1, 18))
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_setaffinity") or len(os.sched_getaffinity(0)) < 2,
+    reason="needs sched_setaffinity and at least two CPUs",
+)
+def test_pin_reader_and_writer():
+    original = os.sched_getaffinity(0)
+    stop = multiprocessing.Event()
+    writer = multiprocessing.Process(target=stop.wait)
+    writer.start()
+
+    reader_affinity = _pin_reader_and_writer(writer.pid)
+    try:
+        assert reader_affinity == original
+        writer_cpus = os.sched_getaffinity(writer.pid)
+        assert len(writer_cpus) == 1
+        assert os.sched_getaffinity(0) == original - writer_cpus
+    finally:
+        os.sched_setaffinity(0, reader_affinity)
+        stop.set()
+        writer.join()
@@ -24,14 +24,15 @@ def discover(timeout_sec = 3):
     devices = []
 
     try:
-        start_time = time.time()
+        # Monotonic so a wall-clock adjustment mid-discovery can't stretch or cut it short
+        deadline = time.monotonic() + timeout_sec
 
         sent = sock.sendto(
             "DISCOVER".encode("ascii"),
             (BROADCAST_ADDR, BROADCAST_PORT),
         )
         while True:
-            if time.time() - start_time > 3:
+            if time.monotonic() > deadline:
                 break
             try:
                 data, server = sock.recvfrom(1024)
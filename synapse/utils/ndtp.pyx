@@ -2,6 +2,8 @@ import cython
 import struct
 from typing import List, Tuple
 
+import numpy as np
+
 from cython cimport boundscheck, wraparound
 from cpython.buffer cimport PyBUF_SIMPLE
 from cpython.bytes cimport PyBytes_FromStringAndSize
@@ -52,7 +54,7 @@ def to_bytes(
 
     # Extend buffer if necessary
     if len(buffer) < total_bytes_needed:
-        buffer.extend([0] * (total_bytes_needed - len(buffer)))
+        buffer.extend(bytes(total_bytes_needed - len(buffer)))
 
     # Get a writable memoryview of the buffer
     cdef unsigned char[::1] buffer_view = buffer
@@ -120,8 +122,6 @@ def to_bytes(
     return buffer, final_bit_offset
 
 
-@boundscheck(False)
-@wraparound(False)
 def to_ints(
     data,
     int bit_width,
@@ -130,22 +130,42 @@ def to_ints(
     bint is_signed = False,
     byteorder: str = 'big'
 ) -> Tuple[List[int], int, object]:
+    cdef int[::1] values
+    values, end_bit, data = to_int_array(data, bit_width, count, start_bit, is_signed, byteorder)
+    return [values[i] for i in range(values.shape[0])], end_bit, data
+
+
+@boundscheck(False)
+@wraparound(False)
+def to_int_array(
+    data,
+    int bit_width,
+    int count = 0,
+    int start_bit = 0,
+    bint is_signed = False,
+    byteorder: str = 'big'
+):
+    """
+    Same as to_ints, but returns the values as an int memoryview so callers can
+    hand them to numpy without boxing every sample as a Python int.
+    """
     if bit_width <= 0:
         raise ValueError("bit width must be > 0")
 
     cdef int truncate_bytes = start_bit // 8
     start_bit = start_bit % 8
 
-    data = data[truncate_bytes:]
-
-    # Convert data to a memoryview
-    cdef const unsigned char[::1] data_view
-
+    # Slice through a memoryview so skipping already-consumed bytes doesn't copy
+    # the rest of the buffer on every call
     if isinstance(data, (bytes, bytearray)):
-        data_view = data
-    else:
+        data = memoryview(data)
+    elif not isinstance(data, memoryview):
         raise TypeError("Unsupported data type: " + str(type(data)))
 
+    data = data[truncate_bytes:]
+
+    cdef const unsigned char[::1] data_view = data
+
     cdef Py_ssize_t data_len = len(data_view)
 
     if count > 0 and data_len < (bit_width * count + 7) // 8:
@@ -158,8 +178,7 @@ def to_ints(
     cdef int bits_in_current_value = 0
     cdef int mask = (1 << bit_width) - 1
     cdef int total_bits_read = 0
-    cdef int byte_index, bit_index, bit
-    cdef int start
+    cdef int byte_index, bit_pos, bits_left_in_byte, n_bits, chunk
     cdef int value_index = 0
     cdef int max_values = count if count > 0 else (data_len * 8) // bit_width
     if max_values == 0:
@@ -167,58 +186,73 @@ def to_ints(
     cdef int[::1] values_array = cython.view.array(shape=(max_values,), itemsize=cython.sizeof(cython.int), format="i")
     cdef int sign_bit = 1 << (bit_width - 1)
     cdef uint8_t byte
+    cdef bint byteorder_is_little
 
+    if byteorder == 'little':
+        byteorder_is_little = True
+    elif byteorder == 'big':
+        byteorder_is_little = False
+    else:
+        raise ValueError("Invalid byteorder: " + byteorder)
+
+    # Whole-byte values starting on a byte boundary (e.g. 16-bit broadband) need
+    # no bit shuffling; assemble each value straight from its bytes
+    cdef int n_bytes = bit_width // 8
+    cdef int n_values, k
+    if start_bit == 0 and bit_width % 8 == 0 and bit_width <= 24 and (count > 0 or data_len % n_bytes == 0):
+        n_values = count if count > 0 else data_len // n_bytes
+        for value_index in range(n_values):
+            current_value = 0
+            for k in range(n_bytes):
+                byte = data_view[value_index * n_bytes + k]
+                if byteorder_is_little:
+                    current_value |= byte << (8 * k)
+                else:
+                    current_value = (current_value << 8) | byte
+
+            if is_signed and (current_value & sign_bit):
+                current_value = current_value - (1 << bit_width)
+            values_array[value_index] = current_value
+
+        return values_array[:n_values], n_values * bit_width, data
+
+    # Consume each byte in as few chunks as possible (at most one per value
+    # boundary it straddles) instead of one bit at a time
     for byte_index in range(data_len):
         byte = data_view[byte_index]
+        bit_pos = start_bit if byte_index == 0 else 0
 
-        if byteorder == 'little':
-            start = start_bit if byte_index == 0 else 0
-            for bit_index in range(start, 8):
-                bit = (byte >> bit_index) & 1
-                current_value |= bit << bits_in_current_value
-                bits_in_current_value += 1
-                total_bits_read += 1
-
-                if bits_in_current_value == bit_width:
-                    if is_signed:
-                        if current_value & sign_bit:
-                            current_value = current_value - (1 << bit_width)
-                    else:
-                        current_value = current_value & mask
-                    values_array[value_index] = current_value
-                    value_index += 1
-                    current_value = 0
-                    bits_in_current_value = 0
-
-                    if count > 0 and value_index == count:
-                        end_bit = start_bit + total_bits_read
-                        return [values_array[i] for i in range(value_index)], end_bit, data
-
-        elif byteorder == 'big':
-            start = start_bit if byte_index == 0 else 0
-            for bit_index in range(7 - start, -1, -1):
-                bit = (byte >> bit_index) & 1
-                current_value = (current_value << 1) | bit
-                bits_in_current_value += 1
-                total_bits_read += 1
-
-                if bits_in_current_value == bit_width:
-                    if is_signed:
-                        if current_value & sign_bit:
-                            current_value = current_value - (1 << bit_width)
-                    else:
-                        current_value = current_value & mask
-                    values_array[value_index] = current_value
-                    value_index += 1
-                    current_value = 0
-                    bits_in_current_value = 0
-
-                    if count > 0 and value_index == count:
-                        end_bit = start_bit + total_bits_read
-                        return [values_array[i] for i in range(value_index)], end_bit, data
+        while bit_pos < 8:
+            n_bits = min(8 - bit_pos, bit_width - bits_in_current_value)
 
-        else:
-            raise ValueError("Invalid byteorder: " + byteorder)
+            if byteorder_is_little:
+                # Bits are read LSB first; later bits land in higher positions
+                chunk = (byte >> bit_pos) & ((1 << n_bits) - 1)
+                current_value |= chunk << bits_in_current_value
+            else:
+                # Bits are read MSB first; later bits land in lower positions
+                bits_left_in_byte = 8 - bit_pos
+                chunk = (byte >> (bits_left_in_byte - n_bits)) & ((1 << n_bits) - 1)
+                current_value = (current_value << n_bits) | chunk
+
+            bit_pos += n_bits
+            bits_in_current_value += n_bits
+            total_bits_read += n_bits
+
+            if bits_in_current_value == bit_width:
+                if is_signed:
+                    if current_value & sign_bit:
+                        current_value = current_value - (1 << bit_width)
+                else:
+                    current_value = current_value & mask
+                values_array[value_index] = current_value
+                value_index += 1
+                current_value = 0
+                bits_in_current_value = 0
+
+                if count > 0 and value_index == count:
+                    end_bit = start_bit + total_bits_read
+                    return values_array[:value_index], end_bit, data
 
     if bits_in_current_value > 0:
         if bits_in_current_value == bit_width:
@@ -237,7 +271,7 @@ def to_ints(
         value_index = min(value_index, count)
 
     end_bit = start_bit + total_bits_read
-    return [values_array[i] for i in range(value_index)], end_bit, data
+    return values_array[:value_index], end_bit, data
 
 
 cdef class NDTPPayloadBroadbandChannelData:
@@ -335,10 +369,9 @@ cdef class NDTPPayloadBroadband:
 
         cdef list channels = []
         cdef int channel_id, num_samples
-        cdef list channel_data
         cdef NDTPPayloadBroadbandChannelData channel
 
-        truncated = data[7:]
+        truncated = memoryview(data)[7:]
         bit_offset = 0
 
         for c in range(num_channels):
@@ -348,9 +381,11 @@ cdef class NDTPPayloadBroadband:
             a_num_samples, bit_offset, truncated = to_ints(data=truncated, bit_width=16, count=1, start_bit=bit_offset, is_signed=False)
             num_samples = a_num_samples[0]
 
-            channel_data, bit_offset, truncated = to_ints(data=truncated, bit_width=bit_width, count=num_samples, start_bit=bit_offset, is_signed=is_signed)
+            channel_data, bit_offset, truncated = to_int_array(data=truncated, bit_width=bit_width, count=num_samples, start_bit=bit_offset, is_signed=is_signed)
 
-            channel = NDTPPayloadBroadbandChannelData(channel_id, channel_data)
+            # Hand out an ndarray over the decoded buffer rather than the Cython
+            # memoryview itself, which can't be pickled
+            channel = NDTPPayloadBroadbandChannelData(channel_id, np.asarray(channel_data))
             channels.append(channel)
 
         return NDTPPayloadBroadband(is_signed, bit_width, sample_rate, channels)
@@ -444,8 +479,8 @@ cdef class NDTPPayloadSpiketrain:
             msg += ")"
             raise ValueError(msg)
 
-        # Unpack spike_counts
-        spike_counts, _, _ = to_ints(
+        # Unpack spike_counts straight into an int buffer; no Python list round trip
+        spike_counts, _, _ = to_int_array(
             payload[:bytes_needed], NDTPPayloadSpiketrain_BIT_WIDTH, num_spikes, is_signed=False
         )
 
@@ -492,16 +527,14 @@ cdef class NDTPHeader:
 
     @staticmethod
     def unpack(data):
-        if isinstance(data, bytes):
-            data = bytearray(data)
-
         cdef int expected_size = NDTPHeader.STRUCT.size
         if len(data) < expected_size:
             raise ValueError(
                 "Invalid header size " + str(len(data)) + ": expected " + str(expected_size)
             )
 
-        version, data_type, timestamp, seq_number = NDTPHeader.STRUCT.unpack(bytes(data[:expected_size]))
+        # Read the header in place; trailing bytes (e.g. a full message) are ignored
+        version, data_type, timestamp, seq_number = NDTPHeader.STRUCT.unpack_from(data)
         if version != NDTP_VERSION:
             raise ValueError(
                 "Incompatible version " + str(version) + ": expected " + hex(NDTP_VERSION) + ", got " + hex(version)
@@ -570,8 +603,8 @@ cdef class NDTPMessage:
         cdef int pdtype
         cdef object payload = None
 
-        header = NDTPHeader.unpack(data[:header_size])
-        crc16_value = struct.unpack(">H", bytes(data[-2:]))[0]
+        header = NDTPHeader.unpack(data)
+        crc16_value = struct.unpack_from(">H", data, len(data) - 2)[0]
 
         pbytes = data[header_size:-2]
         pdtype = header.data_type
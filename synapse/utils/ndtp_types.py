@@ -38,28 +38,32 @@ class ElectricalBroadbandData:
         packets = []
         seq = seq_number
 
+        # Bind loop invariants to locals once rather than per packet
+        t0 = self.t0
+        is_signed = self.is_signed
+        bit_width = self.bit_width
+        sample_rate = self.sample_rate
+        data_type = DataType.kBroadband
+
         try: 
-            for ch_samples in self.samples:
-                ch_id = ch_samples[0]
-                ch_data = ch_samples[1]
+            for ch_id, ch_data in self.samples:
                 if (len(ch_data) == 0):
                     continue
 
                 n_samples = 0
 
-                for ch_sample_sub in chunk_channel_data(self.bit_width, ch_data, MAX_CH_PAYLOAD_SIZE_BYTES):
-                    t_offset = round(n_samples * 1e6 / self.sample_rate)
-                    timestamp = self.t0 + t_offset
+                for ch_sample_sub in chunk_channel_data(bit_width, ch_data, MAX_CH_PAYLOAD_SIZE_BYTES):
+                    timestamp = t0 + round(n_samples * 1e6 / sample_rate)
                     msg = NDTPMessage(
                         header=NDTPHeader(
-                            data_type=DataType.kBroadband,
+                            data_type=data_type,
                             timestamp=timestamp,
                             seq_number=seq,
                         ),
                         payload=NDTPPayloadBroadband(
-                            is_signed=self.is_signed,
-                            bit_width=self.bit_width,
-                            sample_rate=self.sample_rate,
+                            is_signed=is_signed,
+                            bit_width=bit_width,
+                            sample_rate=sample_rate,
                             channels=[
                                 NDTPPayloadBroadbandChannelData(
                                     channel_id=ch_id, channel_data=ch_sample_sub
@@ -68,8 +72,7 @@ class ElectricalBroadbandData:
                         ),
                     )
                     n_samples += len(ch_sample_sub)
-                    packed = msg.pack()
-                    packets.append(packed)
+                    packets.append(msg.pack())
                     seq = (seq + 1) % 2**16
         except Exception as e:
             print(f"Error packing NDTP message: {e}")
@@ -78,14 +81,19 @@ class ElectricalBroadbandData:
 
     @staticmethod
     def from_ndtp_message(msg: NDTPMessage):
-        dtype = np.int16 if msg.payload.is_signed else np.uint16
+        # Wide enough for the payload's bit width; a narrower cast would silently
+        # wrap samples wider than 16 bits
+        if msg.payload.bit_width <= 16:
+            dtype = np.int16 if msg.payload.is_signed else np.uint16
+        else:
+            dtype = np.int32 if msg.payload.is_signed else np.uint32
         return ElectricalBroadbandData(
             t0=msg.header.timestamp,
             bit_width=msg.payload.bit_width,
             is_signed=msg.payload.is_signed,
             sample_rate=msg.payload.sample_rate,
             samples=[
-                (ch.channel_id, np.array(ch.channel_data, dtype=dtype))
+                (ch.channel_id, np.asarray(ch.channel_data).astype(dtype))
                 for ch in msg.payload.channels
             ],
         )
@@ -134,7 +142,9 @@ class SpiketrainData:
         return SpiketrainData(
             t0=msg.header.timestamp,
             bin_size_ms=msg.payload.bin_size_ms,
-            spike_counts=msg.payload.spike_counts,
+            # Own the counts as a numpy array; the payload's Cython memoryview can't
+            # be pickled, e.g. to hand the data to another process
+            spike_counts=np.asarray(msg.payload.spike_counts),
         )
 
     @staticmethod
@@ -143,7 +153,7 @@ class SpiketrainData:
         return SpiketrainData.from_ndtp_message(u)
 
     def to_list(self):
-        return [self.t0, self.bin_size_ms, list(self.spike_counts)]
+        return [self.t0, self.bin_size_ms, np.asarray(self.spike_counts).tolist()]
 
 
 SynapseData = Union[SpiketrainData, ElectricalBroadbandData]
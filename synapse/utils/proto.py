@@ -0,0 +1,24 @@
+import json
+
+from google.protobuf.json_format import ParseDict, ParseError
+
+try:
+    import orjson as json_loader
+except ImportError:
+    json_loader = json
+
+
+def load_proto_from_file(path, proto):
+    # Decode the JSON up front (with orjson when available) and hand the dict
+    # straight to ParseDict, rather than going through json_format.Parse. Unlike
+    # Parse, duplicate keys aren't rejected; the last one wins.
+    with open(path, "rb") as f:
+        data = f.read()
+
+    try:
+        js = json_loader.loads(data)
+    except ValueError as e:
+        # Report malformed JSON the way json_format.Parse does
+        raise ParseError(f"Failed to load JSON: {e}.") from e
+
+    return ParseDict(js, proto)